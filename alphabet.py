@@ -22,6 +22,9 @@ class Alphabet:
         for i in range(len(self)):
             yield self[i]
 
+    def __contains__(self, char: str) -> bool:
+        return 0 <= self.char_to_index(char) < len(self)
+
     def index(self, char: str) -> int:
         index = self.char_to_index(char)
         if index >= len(self) or index < 0:
@@ -29,6 +32,26 @@ class Alphabet:
         return index
 
 
+def minimal_alphabet(string: str, alphabet: Alphabet | None = None) -> Alphabet:
+    """
+    Builds a dense alphabet containing only the characters that appear in `string`.
+    If `alphabet` is given, every character is validated against it,
+    and the characters keep the order they have in `alphabet`.
+    Otherwise any character is allowed, and they are ordered by code point.
+    """
+    if alphabet is not None:
+        characters = sorted(set(string), key=alphabet.index)
+    else:
+        characters = sorted(set(string))
+
+    indices = {char: i for i, char in enumerate(characters)}
+
+    # Characters outside the alphabet map to an out of range index
+    return Alphabet(
+        characters.__getitem__, lambda x: indices.get(x, -1), len(characters)
+    )
+
+
 printable_ascii_letters = Alphabet(lambda x: chr(x + 32), lambda x: ord(x) - 32, 96)
 
 five_letters = Alphabet(lambda x: chr(x + ord("a")), lambda x: ord(x) - ord("a"), 5)
@@ -19,6 +19,9 @@ class Node:
 
         self.suffix_start: int | None = start_index
 
+        # Number of leaves below this node, filled in by `SuffixTree.count_leaves`
+        self.leaf_count: int | None = None
+
     def __getitem__(self, character: str) -> Edge | None:
         return self.edges[self.alphabet.index(character)]
 
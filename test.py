@@ -5,13 +5,17 @@ from unittest import TestCase, main
 from string import ascii_lowercase
 
 from ukkonens import SuffixTree
-from alphabet import printable_ascii_letters
+from alphabet import printable_ascii_letters, lower_case_ascii_letters
 
 
 def create_suffix_tree(string):
     return SuffixTree(string, alphabet=printable_ascii_letters)
 
 
+def create_compact_suffix_tree(string):
+    return SuffixTree(string)
+
+
 def substring_occurrences(suffix_tree, substring) -> set[int]:
     occurrences = set()
 
@@ -45,6 +49,30 @@ def substring_occurrences_naive(string, substring) -> set[int]:
     return occurrences
 
 
+def kmer_frequencies_naive(string, k) -> dict[str, int]:
+    frequencies = defaultdict(lambda: 0)
+
+    for i in range(len(string) - k + 1):
+        frequencies[string[i : i + k]] += 1
+
+    return dict(frequencies)
+
+
+def substrings_naive(string, prefix="") -> list[tuple[str, int]]:
+    distinct = {
+        string[i:j]
+        for i in range(len(string))
+        for j in range(i + max(len(prefix), 1), len(string) + 1)
+        if string.startswith(prefix, i)
+    }
+
+    # `printable_ascii_letters` is ordered by code point, so sorting matches alphabet order
+    return [
+        (substring, len(substring_occurrences_naive(string, substring)))
+        for substring in sorted(distinct)
+    ]
+
+
 class UkkonensTest(TestCase):
     substring_occurrences_count = defaultdict(lambda: 0)
     suffix_matches = 0
@@ -202,6 +230,119 @@ class UkkonensTest(TestCase):
         print("Matches:", self.suffix_matches)
         print("Mismatches:", self.suffix_mismatches)
 
+    def iterative_kmer_test(
+        self,
+        string_count,
+        min_string_length,
+        max_string_length,
+        min_k,
+        max_k,
+        min_character_set_size=2,
+        max_character_set_size=8,
+    ):
+        for _ in range(string_count):
+            random_string = self.create_randomised_string(
+                min_string_length,
+                max_string_length,
+                min_character_set_size,
+                max_character_set_size,
+                sentinal_terminated=True,
+            )
+
+            suffix_tree = create_suffix_tree(random_string)
+
+            for k in range(min_k, max_k + 1):
+                frequencies = kmer_frequencies_naive(random_string, k)
+                result = dict(suffix_tree.kmer_frequencies(k))
+
+                self.assertEqual(frequencies, result)
+
+                min_count = randint(1, 4)
+                result = dict(suffix_tree.kmer_frequencies(k, min_count))
+
+                self.assertEqual(
+                    {kmer: n for kmer, n in frequencies.items() if n >= min_count},
+                    result,
+                )
+
+                top = randint(1, 5)
+                result = suffix_tree.most_frequent_kmers(k, top)
+                counts = sorted(frequencies.values(), reverse=True)[:top]
+
+                self.assertEqual(counts, [n for _, n in result])
+                for kmer, n in result:
+                    self.assertEqual(frequencies[kmer], n)
+
+    def iterative_substrings_enumeration_test(
+        self,
+        string_count,
+        min_string_length,
+        max_string_length,
+        min_character_set_size=2,
+        max_character_set_size=6,
+    ):
+        for _ in range(string_count):
+            random_string = self.create_randomised_string(
+                min_string_length,
+                max_string_length,
+                min_character_set_size,
+                max_character_set_size,
+                sentinal_terminated=True,
+            )
+
+            suffix_tree = create_suffix_tree(random_string)
+            expected = substrings_naive(random_string)
+
+            self.assertEqual(len(expected), suffix_tree.distinct_substring_count())
+
+            result = [
+                (random_string[start : start + length], count)
+                for start, length, count in suffix_tree.substrings()
+            ]
+            self.assertEqual(expected, result)
+
+            limit = randint(1, len(expected))
+            self.assertEqual(limit, len(list(suffix_tree.substrings(limit=limit))))
+
+            prefix = self.create_string(randint(1, 4), max_character_set_size)
+            result = [
+                (random_string[start : start + length], count)
+                for start, length, count in suffix_tree.substrings(prefix)
+            ]
+            self.assertEqual(substrings_naive(random_string, prefix), result)
+
+    def iterative_compact_alphabet_test(
+        self,
+        string_count,
+        min_string_length,
+        max_string_length,
+        pattern_count,
+        min_pattern_length,
+        max_pattern_length,
+    ):
+        # Includes characters outside of ASCII, which no predefined alphabet supports
+        characters = "ab\u00e9\u03bb\u4e2d\U0001f600"
+
+        for _ in range(string_count):
+            length = randint(min_string_length, max_string_length)
+            random_string = "".join(choices(characters, k=length)) + "$"
+
+            suffix_tree = create_compact_suffix_tree(random_string)
+
+            self.assertLessEqual(len(suffix_tree.alphabet), len(characters) + 1)
+
+            for _ in range(pattern_count):
+                length = randint(min_pattern_length, max_pattern_length)
+                # `z` never appears in the string, so must never be found
+                random_pattern = "".join(choices(characters + "z", k=length))
+
+                self.substring_occurrences_test(
+                    suffix_tree, random_string, random_pattern
+                )
+                self.suffix_occurrence_test(
+                    suffix_tree, random_string, random_pattern + "$"
+                )
+
     def test_small_string_robustness(self):
         self.iterative_robust_test(
             string_count=10000, min_string_length=5, max_string_length=10
@@ -243,6 +384,57 @@ class UkkonensTest(TestCase):
             max_character_set_size=8,
         )
 
+    def test_kmer_frequencies(self):
+        self.iterative_kmer_test(
+            string_count=500,
+            min_string_length=5,
+            max_string_length=200,
+            min_k=1,
+            max_k=8,
+        )
+
+    def test_substrings_enumeration(self):
+        self.iterative_substrings_enumeration_test(
+            string_count=500, min_string_length=2, max_string_length=60
+        )
+
+    def test_compact_alphabet(self):
+        self.iterative_compact_alphabet_test(
+            string_count=200,
+            min_string_length=20,
+            max_string_length=200,
+            pattern_count=200,
+            min_pattern_length=1,
+            max_pattern_length=6,
+        )
+
+    def test_compact_alphabet_keeps_source_order(self):
+        for _ in range(100):
+            random_string = self.create_randomised_string(
+                5, 60, 2, 6, sentinal_terminated=True
+            )
+
+            suffix_tree = create_suffix_tree(random_string)
+            compact_suffix_tree = SuffixTree(
+                random_string, printable_ascii_letters, compact_alphabet=True
+            )
+
+            self.assertEqual(
+                list(suffix_tree.substrings()), list(compact_suffix_tree.substrings())
+            )
+
+            # Valid in the source alphabet, but absent from the string
+            self.assertEqual([], list(compact_suffix_tree.substring_occurrences("~")))
+
+    def test_compact_alphabet_validates_upfront(self):
+        with self.assertRaises(ValueError):
+            SuffixTree("abc$", lower_case_ascii_letters, compact_alphabet=True)
+
+        suffix_tree = SuffixTree("abc", lower_case_ascii_letters, compact_alphabet=True)
+
+        with self.assertRaises(ValueError):
+            list(suffix_tree.substring_occurrences("A"))
+
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,29 @@
+import heapq
 from typing import Generator, Set
 from edge import Edge, EdgeFactory, Pointer
 from node import Node
 from remainder import Remainder
-from alphabet import Alphabet, printable_ascii_letters
+from alphabet import Alphabet, minimal_alphabet, printable_ascii_letters
 
 
 class SuffixTree:
-    def __init__(self, string: str, alphabet: Alphabet) -> None:
+    def __init__(
+        self,
+        string: str,
+        alphabet: Alphabet | None = None,
+        compact_alphabet: bool = False,
+    ) -> None:
         self.string: str = string
+
+        # Without an alphabet, or when asked to, the tree is built over only
+        # the characters in `string`, which keeps every node's edge table small.
+        # This also validates the whole string before any construction work is done.
+        self.compact_alphabet: bool = alphabet is None or compact_alphabet
+        self.source_alphabet: Alphabet | None = alphabet
+
+        if self.compact_alphabet:
+            alphabet = minimal_alphabet(string, alphabet)
+
         self.alphabet: Alphabet = alphabet
 
         self.phase: int = 0
@@ -32,6 +48,9 @@ class SuffixTree:
 
         self.edge_factory = EdgeFactory(self.string, self.global_pointer)
 
+        # Leaf counts are only computed when a frequency query first needs them
+        self.leaves_counted: bool = False
+
         self.ukkonens()
 
     def ukkonens(self) -> None:
@@ -177,6 +196,21 @@ class SuffixTree:
             return None
         return self.active_node[self.remainder.first_character]
 
+    def in_alphabet(self, pat: str) -> bool:
+        """
+        With a compact alphabet, characters that are valid in the source alphabet
+        may still be missing from the tree's alphabet.
+        Such patterns cannot occur in the string, rather than being an error.
+        """
+        if not self.compact_alphabet:
+            return True
+
+        if self.source_alphabet is not None:
+            for character in pat:
+                self.source_alphabet.index(character)
+
+        return all(character in self.alphabet for character in pat)
+
     def contains_suffix(self, pat: str) -> int | None:
         if len(pat) == 0:
             return len(self.string)
@@ -184,6 +218,9 @@ class SuffixTree:
         if len(pat) > len(self.string):
             return None
 
+        if not self.in_alphabet(pat):
+            return None
+
         i = 0
         current_node = self.root
         current_edge = self.root[pat[i]]
@@ -216,6 +253,9 @@ class SuffixTree:
         if len(pat) > len(self.string):
             return
 
+        if not self.in_alphabet(pat):
+            return
+
         i = 0
         current_node = self.root
         current_edge = self.root[pat[i]]
@@ -270,3 +310,148 @@ class SuffixTree:
 
             if current_node.is_leaf:
                 yield current_node.suffix_start
+
+    def count_leaves(self) -> None:
+        """
+        Stores the number of leaves below every node in `Node.leaf_count`.
+        The number of leaves below a node is the number of occurrences
+        of the substring spelt out by the path to that node.
+        The tree does not change after it is built, so this only runs once.
+        """
+        if self.leaves_counted:
+            return
+
+        # Iterative post-order traversal, as long strings would exceed the recursion limit
+        stack: list[tuple[Node, bool]] = [(self.root, False)]
+
+        while len(stack) != 0:
+            node, children_counted = stack.pop()
+
+            if node.is_leaf:
+                node.leaf_count = 1
+            elif children_counted:
+                node.leaf_count = sum(edge.end_node.leaf_count for edge in node)
+            else:
+                stack.append((node, True))
+                for edge in node:
+                    stack.append((edge.end_node, False))
+
+        self.leaves_counted = True
+
+    def kmer_frequencies(
+        self, k: int, min_count: int = 1
+    ) -> Generator[tuple[str, int], None, None]:
+        """
+        Yields every distinct substring of length `k` alongside its number of occurrences,
+        skipping substrings that occur fewer than `min_count` times.
+        Each substring of length `k` ends on exactly one edge,
+        so a single traversal that stops at string depth `k` finds all of them.
+        Like `substring_occurrences`, the counts assume the string ends with a unique terminator.
+        """
+        if k <= 0:
+            raise ValueError("`k` must be positive")
+
+        self.count_leaves()
+
+        # Each entry is an edge and the string depth of the node it starts from
+        stack: list[tuple[Edge, int]] = [(edge, 0) for edge in self.root]
+
+        while len(stack) != 0:
+            edge, depth = stack.pop()
+            end_depth = depth + len(edge)
+
+            if end_depth < k:
+                for child in edge.end_node:
+                    stack.append((child, end_depth))
+                continue
+
+            count = edge.end_node.leaf_count
+            if count >= min_count:
+                start = edge.start_index - depth
+                yield self.string[start : start + k], count
+
+    def most_frequent_kmers(self, k: int, top: int) -> list[tuple[str, int]]:
+        """
+        Returns the `top` most frequent substrings of length `k`,
+        alongside their number of occurrences, most frequent first.
+        """
+        return heapq.nlargest(top, self.kmer_frequencies(k), key=lambda kmer: kmer[1])
+
+    def distinct_substring_count(self) -> int:
+        """
+        Every distinct non-empty substring ends at exactly one position along one edge,
+        so the number of distinct substrings is the total length of all edges.
+        """
+        count = 0
+        stack: list[Node] = [self.root]
+
+        while len(stack) != 0:
+            node = stack.pop()
+            for edge in node:
+                count += len(edge)
+                stack.append(edge.end_node)
+
+        return count
+
+    def substrings(
+        self, prefix: str = "", limit: int | None = None
+    ) -> Generator[tuple[int, int, int], None, None]:
+        """
+        Lazily yields every distinct substring starting with `prefix`,
+        in the lexicographic order given by the alphabet,
+        as `(start index, length, occurrence count)` tuples.
+        At most `limit` substrings are yielded, if given.
+        Like `substring_occurrences`, the counts assume the string ends with a unique terminator.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        if not self.in_alphabet(prefix):
+            return
+
+        self.count_leaves()
+
+        # Each entry is an edge, the string depth of the node it starts from,
+        # and the offset into the edge of the first substring to yield
+        stack: list[tuple[Edge, int, int]] = []
+
+        if len(prefix) == 0:
+            stack.extend((edge, 0, 1) for edge in reversed(list(self.root)))
+        else:
+            depth = 0
+            current_edge = self.root[prefix[0]]
+
+            while current_edge is not None:
+                matched = min(len(current_edge), len(prefix) - depth)
+
+                for j in range(matched):
+                    if prefix[depth + j] != current_edge[j]:
+                        return
+
+                if depth + matched == len(prefix):
+                    stack.append((current_edge, depth, matched))
+                    break
+
+                depth += len(current_edge)
+                current_edge = current_edge.end_node[prefix[depth]]
+
+        yielded = 0
+
+        while len(stack) != 0:
+            edge, depth, first = stack.pop()
+            start = edge.start_index - depth
+            count = edge.end_node.leaf_count
+
+            # Shorter substrings along an edge are prefixes of the longer ones,
+            # so they come first, followed by everything below the edge
+            for length in range(depth + first, depth + len(edge) + 1):
+                yield start, length, count
+
+                yielded += 1
+                if yielded == limit:
+                    return
+
+            end_depth = depth + len(edge)
+            stack.extend(
+                (child, end_depth, 1) for child in reversed(list(edge.end_node))
+            )